@@ -19,20 +19,21 @@ class ExampleAgent(BaseAgent):
         """Process user message and return response"""
         
         # Simple echo functionality with some processing
-        response_parts = [
-            f"Hello! I'm {self.config.name}.",
-            f"You said: '{message}'",
+        # (fixed parts in one f-string; optional parts appended only when present)
+        response = (
+            f"Hello! I'm {self.config.name}. | You said: '{message}' | "
             f"Message length: {len(message)} characters"
-        ]
+        )
         
         # Add context info if available
+        # (join iterates the dict's keys directly - no intermediate list or repr)
         if context:
-            response_parts.append(f"Context keys: {list(context.keys())}")
+            response += " | Context keys: " + ", ".join(context)
         
         if user_id:
-            response_parts.append(f"User ID: {user_id}")
+            response += f" | User ID: {user_id}"
             
-        return " | ".join(response_parts)
+        return response
 
 
 if __name__ == "__main__":
@@ -7,15 +7,16 @@ __version__ = "1.1.0"
 __author__ = "GRAAL Team"
 __email__ = "contact@holygraal.io"
 
-from .base import BaseAgent, AgentConfig
+from .base import BaseAgent, AgentConfig, BatchedChatMixin
 from .models import HealthResponse, ChatRequest, ChatResponse, AgentStatus
 from .llm import LLMClient, LLMConfig, LLMProvider, BaseLLMAgent
-from .framework_manager import FrameworkManager, FrameworkVersion, UpdateResult
+from .framework_manager import FrameworkManager, FrameworkVersion, UpdateResult, GitHubRateLimitError
 from .migration_manager import MigrationManager, FrameworkMigration, MigrationStep
 
 __all__ = [
     "BaseAgent",
     "AgentConfig", 
+    "BatchedChatMixin",
     "HealthResponse",
     "ChatRequest", 
     "ChatResponse",
@@ -27,6 +28,7 @@ __all__ = [
     "FrameworkManager",
     "FrameworkVersion",
     "UpdateResult",
+    "GitHubRateLimitError",
     "MigrationManager",
     "FrameworkMigration", 
     "MigrationStep",
@@ -3,22 +3,27 @@ Base Agent class and configuration for GRAAL agents
 Provides common functionality and structure for all conversational agents
 """
 import asyncio
+import itertools
 import logging
 import time
 import os
+import sys
 try:
     import psutil
     HAS_PSUTIL = True
 except ImportError:
     HAS_PSUTIL = False
+from collections import OrderedDict
 from contextlib import asynccontextmanager
-from datetime import datetime
-from typing import Dict, Any, List, Optional, Callable
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional, Callable, Awaitable, Set, Tuple
 from abc import ABC, abstractmethod
 
+import orjson
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
 
 from .models import (
     HealthResponse, 
@@ -26,9 +31,72 @@ from .models import (
     ChatResponse, 
     AgentStatusResponse,
     AgentStatus,
-    AgentCapability
+    AgentCapability,
+    _utcnow
 )
-from .framework_manager import FrameworkManager, FrameworkVersion, UpdateResult
+from .framework_manager import FrameworkManager, FrameworkVersion, UpdateResult, GitHubRateLimitError
+
+# Health and status responses are reused for this long (probe traffic)
+RESPONSE_CACHE_TTL_SECONDS = 0.5
+
+# Framework version listings change on the order of hours
+FRAMEWORK_CACHE_TTL_SECONDS = 300.0
+
+# How often the background sampler refreshes the memory figure in /status
+MEMORY_SAMPLE_INTERVAL_SECONDS = 5.0
+
+# FastAPI releases that serialize response models to JSON bytes with pydantic-core
+# deprecate ORJSONResponse (warning on every response); keep their default there
+_DEFAULT_RESPONSE_CLASS = JSONResponse if getattr(ORJSONResponse, "__deprecated__", None) else ORJSONResponse
+
+_logging_configured = False
+
+
+def _orjson_response(content: Any) -> Response:
+    """JSON response encoded with orjson; FastAPI sends a Response as is, skipping response-model validation"""
+    return Response(orjson.dumps(content), media_type="application/json")
+
+
+class _JsonFormatter(logging.Formatter):
+    """Formats log records as single-line JSON objects"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry).decode()
+
+
+def _configure_logging(level: str, log_format: str = "text"):
+    """
+    Configure process-wide logging once
+    Later agents reuse the first configuration; an existing root handler set up
+    by the host application is left untouched.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    _logging_configured = True
+    
+    if logging.getLogger().handlers:
+        return
+    
+    # Agent log records don't use thread/process info; skip collecting it
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    handler = logging.StreamHandler()
+    if log_format == "json":
+        handler.setFormatter(_JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT, style="%"))
+    logging.basicConfig(level=getattr(logging, level.upper()), handlers=[handler])
 
 
 class AgentConfig(BaseModel):
@@ -42,14 +110,24 @@ class AgentConfig(BaseModel):
     # Framework settings
     framework_version: str = Field(default="1.0.0", description="GRAAL framework version")
     log_level: str = Field(default="INFO", description="Logging level")
+    log_format: str = Field(default="text", description="Log output format: text or json")
     cors_origins: List[str] = Field(default=["*"], description="CORS allowed origins")
+    cors_enabled: bool = Field(default=True, description="Install CORS middleware (disable for backend-only agents)")
     
     # Performance settings
     request_timeout_seconds: float = Field(default=30.0, description="Request timeout")
     max_message_length: int = Field(default=10000, description="Maximum message length")
     
-    class Config:
-        json_schema_extra = {
+    # Batching settings (used by BatchedChatMixin)
+    batch_max_size: int = Field(default=8, ge=1, description="Maximum chat requests per batch")
+    batch_max_delay_ms: float = Field(default=5.0, ge=0.0, description="Maximum wait for a batch to fill")
+    
+    # Response cache settings (opt-in: only for agents with deterministic answers)
+    response_cache_enabled: bool = Field(default=False, description="Reuse responses for repeated chat requests")
+    response_cache_size: int = Field(default=1024, ge=1, description="Maximum cached chat responses")
+    
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "name": "Marketing Assistant",
                 "slug": "marketing-assistant",
@@ -58,6 +136,7 @@ class AgentConfig(BaseModel):
                 "version": "1.0.0"
             }
         }
+    )
 
 
 class BaseAgent(ABC):
@@ -75,11 +154,33 @@ class BaseAgent(ABC):
     def __init__(self, config: AgentConfig):
         self.config = config
         self.start_time = time.time()
-        self.last_request_time: Optional[datetime] = None
+        self._last_request_time_ns: Optional[int] = None
         self.request_count = 0
+        self._request_counter = itertools.count(1)
+        
+        # Short-lived caches for probe endpoints: (monotonic timestamp, response)
+        self._health_cache: Optional[Tuple[float, HealthResponse]] = None
+        self._status_cache: Optional[Tuple[float, AgentStatusResponse]] = None
+        
+        # Memory usage, refreshed by a background task while the app runs
+        self._memory_mb: Optional[float] = None
+        self._memory_sampler_task: Optional[asyncio.Task] = None
+        self._process = psutil.Process() if HAS_PSUTIL else None
+        
+        # LRU of chat responses keyed by (message, user_id, context)
+        self._chat_cache: "OrderedDict[Tuple[Any, ...], str]" = OrderedDict()
+        
+        # Response fields that never change after construction
+        self._static_health_fields = {
+            "agent_name": config.name,
+            "agent_slug": config.slug,
+            "version": config.version,
+            "framework_version": config.framework_version,
+        }
+        self._request_id_prefix = f"{config.slug}-"
         
         # Setup logging
-        logging.basicConfig(level=getattr(logging, config.log_level.upper()))
+        _configure_logging(config.log_level, config.log_format)
         self.logger = logging.getLogger(f"graal.agent.{config.slug}")
         
         # Create FastAPI app
@@ -87,10 +188,29 @@ class BaseAgent(ABC):
         
         # Register capabilities
         self.capabilities: List[AgentCapability] = []
+        self._capabilities_dump: Optional[List[Dict[str, Any]]] = None
         self._register_base_capabilities()
         
         # Framework manager for self-update capabilities
         self.framework_manager = FrameworkManager(config)
+        self._fwk_cache: Dict[Any, Tuple[float, Any]] = {}
+    
+    @property
+    def last_request_time(self) -> Optional[datetime]:
+        """Time of the last chat request (UTC), if any"""
+        if self._last_request_time_ns is None:
+            return None
+        return datetime.fromtimestamp(self._last_request_time_ns / 1e9, timezone.utc).replace(tzinfo=None)
+    
+    @last_request_time.setter
+    def last_request_time(self, value: Optional[datetime]):
+        # Naive datetimes are UTC, as returned by the getter
+        if value is None:
+            self._last_request_time_ns = None
+            return
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        self._last_request_time_ns = round(value.timestamp() * 1e9)
     
     def _create_app(self) -> FastAPI:
         """Create and configure FastAPI application"""
@@ -98,27 +218,43 @@ class BaseAgent(ABC):
         @asynccontextmanager
         async def lifespan(app: FastAPI):
             """Application lifespan management"""
-            self.logger.info(f"🚀 Starting {self.config.name} agent on port {self.config.port}")
-            await self.on_startup()
-            yield
-            await self.on_shutdown()
-            self.logger.info(f"🛑 Shutting down {self.config.name} agent")
+            self.logger.info("🚀 Starting %s agent on port %s", self.config.name, self.config.port)
+            try:
+                await self.on_startup()
+                if HAS_PSUTIL:
+                    self._memory_sampler_task = asyncio.create_task(self._memory_sampler())
+                try:
+                    await self._warmup()
+                except Exception as e:
+                    self.logger.warning("Warm-up failed: %s", e)
+                yield
+                await self.on_shutdown()
+            finally:
+                # Released even when startup or shutdown hooks fail
+                await self.framework_manager.aclose()
+                if self._memory_sampler_task is not None:
+                    self._memory_sampler_task.cancel()
+                    await asyncio.gather(self._memory_sampler_task, return_exceptions=True)
+                    self._memory_sampler_task = None
+            self.logger.info("🛑 Shutting down %s agent", self.config.name)
         
         app = FastAPI(
             title=f"{self.config.name} Agent",
             description=self.config.description,
             version=self.config.version,
             lifespan=lifespan,
+            default_response_class=_DEFAULT_RESPONSE_CLASS,
         )
         
-        # Add CORS middleware
-        app.add_middleware(
-            CORSMiddleware,
-            allow_origins=self.config.cors_origins,
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
+        # Add CORS middleware (skipped for agents only called server-to-server)
+        if self.config.cors_enabled:
+            app.add_middleware(
+                CORSMiddleware,
+                allow_origins=self.config.cors_origins,
+                allow_credentials=True,
+                allow_methods=["*"],
+                allow_headers=["*"],
+            )
         
         # Register routes
         self._register_routes(app)
@@ -126,117 +262,185 @@ class BaseAgent(ABC):
         return app
     
     def _register_routes(self, app: FastAPI):
-        """Register standard routes"""
-        
-        @app.get("/", response_model=HealthResponse)
-        async def root():
-            """Root endpoint with basic agent info"""
-            return await self._get_health_response()
+        """Register standard routes (handlers are bound methods of the agent)"""
+        app.get("/", response_model=HealthResponse, name="root")(self._root_handler)
+        app.get("/healthz", response_model=HealthResponse, name="health_check")(self._health_handler)
+        app.post("/chat", response_model=ChatResponse, name="chat")(self._chat_handler)
+        app.get("/status", response_model=AgentStatusResponse, name="get_status")(self._status_handler)
         
-        @app.get("/healthz", response_model=HealthResponse)
-        async def health_check():
-            """Health check endpoint for monitoring"""
-            return await self._get_health_response()
+        # Framework management endpoints
+        app.get("/fwk/version", name="get_framework_version")(self._fwk_version_handler)
+        app.get(
+            "/fwk/available", response_model=List[FrameworkVersion], name="get_available_versions"
+        )(self._fwk_available_handler)
+        app.post("/fwk/update", response_model=UpdateResult, name="update_framework")(self._fwk_update_handler)
+        app.post("/fwk/clone-test", name="clone_for_testing")(self._fwk_clone_test_handler)
+        app.get("/fwk/migration-info", name="get_migration_info")(self._fwk_migration_info_handler)
+        app.get("/fwk/changelog", name="get_framework_changelog")(self._fwk_changelog_handler)
+    
+    async def _root_handler(self):
+        """Root endpoint with basic agent info"""
+        return _orjson_response((await self._get_health_response()).model_dump())
+    
+    async def _health_handler(self):
+        """Health check endpoint for monitoring"""
+        return _orjson_response((await self._get_health_response()).model_dump())
+    
+    async def _chat_handler(self, request: ChatRequest):
+        """Main chat endpoint"""
+        start_ns = time.monotonic_ns()
+        self._last_request_time_ns = time.time_ns()
+        request_number = next(self._request_counter)
+        self.request_count = request_number
         
-        @app.post("/chat", response_model=ChatResponse)
-        async def chat(request: ChatRequest):
-            """Main chat endpoint"""
-            start_time = time.time()
-            self.last_request_time = datetime.utcnow()
-            self.request_count += 1
+        try:
+            cache_key = self._chat_cache_key(request) if self.config.response_cache_enabled else None
+            response_text = self._chat_cache.get(cache_key) if cache_key is not None else None
             
-            try:
+            if response_text is not None:
+                self._chat_cache.move_to_end(cache_key)
+            else:
                 # Process the message
-                response_text = await self.process_message(
-                    message=request.message,
-                    context=request.context,
-                    user_id=request.user_id,
-                    conversation_id=request.conversation_id
-                )
-                
-                processing_time = (time.time() - start_time) * 1000
-                
-                return ChatResponse(
-                    response=response_text,
-                    agent_name=self.config.name,
-                    context={
-                        "original_message": request.message,
-                        "processed_at": datetime.utcnow().isoformat(),
-                        "request_id": f"{self.config.slug}-{int(time.time())}"
-                    },
-                    processing_time_ms=processing_time
-                )
-                
-            except Exception as e:
-                self.logger.error(f"Error processing message: {e}")
-                raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
-        
-        @app.get("/status", response_model=AgentStatusResponse)
-        async def get_status():
-            """Detailed status endpoint"""
-            return await self._get_detailed_status()
+                response_text = await self._dispatch_chat(request)
+                if cache_key is not None and self._is_cacheable_response(response_text):
+                    self._chat_cache[cache_key] = response_text
+                    if len(self._chat_cache) > self.config.response_cache_size:
+                        self._chat_cache.popitem(last=False)
+            
+            processing_time = (time.monotonic_ns() - start_ns) / 1e6
+            processed_at = _utcnow()  # one clock read for the timestamp and processed_at
+            
+            # Returned pre-encoded: FastAPI skips re-validating the response
+            # model and orjson encodes the datetimes natively
+            return _orjson_response(ChatResponse(
+                response=response_text,
+                agent_name=self.config.name,
+                timestamp=processed_at,
+                context={
+                    "original_message": request.message,
+                    "processed_at": processed_at,
+                    "request_id": f"{self._request_id_prefix}{request_number}"
+                },
+                processing_time_ms=processing_time
+            ).model_dump())
+            
+        except Exception as e:
+            self.logger.error("Error processing message: %s", e)
+            raise HTTPException(status_code=500, detail=f"Processing error: {str(e)}")
+    
+    async def _status_handler(self):
+        """Detailed status endpoint"""
+        status = await self._get_detailed_status()
         
-        # Framework management endpoints
-        @app.get("/fwk/version")
-        async def get_framework_version():
-            """Get current framework version"""
-            return {
-                "current_version": self.framework_manager.get_current_version(),
-                "framework_version": self.config.framework_version,
-                "agent_version": self.config.version
-            }
+        # Serialize directly (orjson handles datetimes), reusing the pre-dumped capability list
+        payload = status.model_dump(exclude={"capabilities"})
+        payload["capabilities"] = self._get_capabilities_dump()
+        return _orjson_response(payload)
+    
+    async def _fwk_version_handler(self):
+        """Get current framework version"""
+        return {
+            "current_version": self.framework_manager.get_current_version(),
+            "framework_version": self.config.framework_version,
+            "agent_version": self.config.version
+        }
+    
+    async def _fwk_available_handler(self):
+        """Get available framework versions"""
+        try:
+            return await self._cached("available_versions", self.framework_manager.get_available_versions)
+        except GitHubRateLimitError as e:
+            raise self._rate_limit_http_error(e)
+    
+    async def _fwk_update_handler(self, target_version: str, run_tests: bool = True):
+        """Update framework to target version"""
+        result = await self.framework_manager.update_framework(target_version, run_tests)
+        if result.success:
+            self._fwk_cache.clear()
+        return result
+    
+    async def _fwk_clone_test_handler(self, clone_name: Optional[str] = None):
+        """Create a test clone of this agent"""
+        clone_path = await self.framework_manager.create_test_clone(clone_name)
+        return {
+            "success": True,
+            "clone_path": str(clone_path),
+            "clone_name": clone_path.name
+        }
+    
+    async def _fwk_migration_info_handler(self, target_version: str):
+        """Get migration information for target version without applying it"""
+        current_version = self.framework_manager.get_current_version()
+        return self.framework_manager.migration_manager.get_migration_info(current_version, target_version.lstrip('v'))
+    
+    async def _fwk_changelog_handler(self):
+        """Get framework changelog with breaking changes info"""
+        current_version = self.framework_manager.get_current_version()
+        try:
+            changelog = await self._cached(
+                ("changelog", current_version),
+                lambda: self._build_changelog(current_version)
+            )
+        except GitHubRateLimitError as e:
+            raise self._rate_limit_http_error(e)
         
-        @app.get("/fwk/available", response_model=List[FrameworkVersion])
-        async def get_available_versions():
-            """Get available framework versions"""
-            return await self.framework_manager.get_available_versions()
+        if changelog is None:
+            # Version listing failed; answer empty without caching it
+            return {"current_version": current_version, "available_updates": []}
+        return changelog
+    
+    @staticmethod
+    def _rate_limit_http_error(error: GitHubRateLimitError) -> HTTPException:
+        """Map a GitHub rate-limit failure to 503 Service Unavailable"""
+        headers = {"Retry-After": str(int(error.retry_after) + 1)} if error.retry_after else None
+        return HTTPException(status_code=503, detail=str(error), headers=headers)
+    
+    async def _cached(
+        self,
+        key: Any,
+        factory: Callable[[], Awaitable[Any]],
+        ttl: float = FRAMEWORK_CACHE_TTL_SECONDS
+    ) -> Any:
+        """Return the cached result for key, calling factory() when missing or older than ttl"""
+        now = time.monotonic()
+        entry = self._fwk_cache.get(key)
+        if entry is not None and now - entry[0] < ttl:
+            return entry[1]
         
-        @app.post("/fwk/update", response_model=UpdateResult)
-        async def update_framework(target_version: str, run_tests: bool = True):
-            """Update framework to target version"""
-            return await self.framework_manager.update_framework(target_version, run_tests)
+        result = await factory()
+        # Empty results usually mean the upstream call failed; don't pin them
+        if result:
+            self._fwk_cache[key] = (now, result)
+        return result
+    
+    async def _build_changelog(self, current_version: str) -> Optional[Dict[str, Any]]:
+        """Build the /fwk/changelog payload for the current version (None if versions are unavailable)"""
+        available_versions = await self._cached(
+            "available_versions", self.framework_manager.get_available_versions
+        )
+        if not available_versions:
+            return None
         
-        @app.post("/fwk/clone-test")
-        async def clone_for_testing(clone_name: Optional[str] = None):
-            """Create a test clone of this agent"""
-            clone_path = await self.framework_manager.create_test_clone(clone_name)
-            return {
-                "success": True,
-                "clone_path": str(clone_path),
-                "clone_name": clone_path.name
-            }
+        migration_infos = self.framework_manager.migration_manager.get_migration_infos(
+            current_version, [version.version for version in available_versions]
+        )
         
-        @app.get("/fwk/migration-info")
-        async def get_migration_info(target_version: str):
-            """Get migration information for target version without applying it"""
-            current_version = self.framework_manager.get_current_version()
-            return self.framework_manager.migration_manager.get_migration_info(current_version, target_version.lstrip('v'))
+        changelog_info = []
+        for version, migration_info in zip(available_versions, migration_infos):
+            if migration_info["migration_available"]:
+                changelog_info.append({
+                    "version": version.version,
+                    "tag": version.tag,
+                    "has_breaking_changes": migration_info["has_code_changes"],
+                    "breaking_changes": migration_info.get("breaking_changes", []),
+                    "changelog": migration_info.get("changelog", ""),
+                    "migration_steps": len(migration_info.get("migration_steps", []))
+                })
         
-        @app.get("/fwk/changelog")
-        async def get_framework_changelog():
-            """Get framework changelog with breaking changes info"""
-            current_version = self.framework_manager.get_current_version()
-            available_versions = await self.framework_manager.get_available_versions()
-            
-            changelog_info = []
-            for version in available_versions:
-                migration_info = self.framework_manager.migration_manager.get_migration_info(
-                    current_version, version.version
-                )
-                if migration_info["migration_available"]:
-                    changelog_info.append({
-                        "version": version.version,
-                        "tag": version.tag,
-                        "has_breaking_changes": migration_info["has_code_changes"],
-                        "breaking_changes": migration_info.get("breaking_changes", []),
-                        "changelog": migration_info.get("changelog", ""),
-                        "migration_steps": len(migration_info.get("migration_steps", []))
-                    })
-            
-            return {
-                "current_version": current_version,
-                "available_updates": changelog_info
-            }
+        return {
+            "current_version": current_version,
+            "available_updates": changelog_info
+        }
     
     def _register_base_capabilities(self):
         """Register base framework capabilities"""
@@ -269,27 +473,31 @@ class BaseAgent(ABC):
         ])
     
     async def _get_health_response(self) -> HealthResponse:
-        """Generate health response"""
-        return HealthResponse(
+        """Generate health response, reusing a cached one for RESPONSE_CACHE_TTL_SECONDS"""
+        now = time.monotonic()
+        if self._health_cache is not None and now - self._health_cache[0] < RESPONSE_CACHE_TTL_SECONDS:
+            return self._health_cache[1]
+        
+        response = HealthResponse(
             status=await self.get_health_status(),
-            agent_name=self.config.name,
-            agent_slug=self.config.slug,
-            version=self.config.version,
-            framework_version=self.config.framework_version,
-            uptime_seconds=time.time() - self.start_time
+            uptime_seconds=time.time() - self.start_time,
+            **self._static_health_fields
         )
+        self._health_cache = (now, response)
+        return response
     
     async def _get_detailed_status(self) -> AgentStatusResponse:
-        """Generate detailed status response"""
-        memory_mb = None
-        if HAS_PSUTIL:
-            try:
-                process = psutil.Process()
-                memory_mb = process.memory_info().rss / 1024 / 1024
-            except:
-                pass
+        """Generate detailed status response, reusing a cached one for RESPONSE_CACHE_TTL_SECONDS"""
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache[0] < RESPONSE_CACHE_TTL_SECONDS:
+            return self._status_cache[1]
         
-        return AgentStatusResponse(
+        memory_mb = self._memory_mb
+        if HAS_PSUTIL and self._memory_sampler_task is None:
+            # No sampler running (app used without lifespan): sample inline
+            memory_mb = self._sample_memory_mb()
+        
+        response = AgentStatusResponse(
             agent_name=self.config.name,
             agent_slug=self.config.slug,
             status=await self.get_health_status(),
@@ -302,6 +510,21 @@ class BaseAgent(ABC):
             memory_usage_mb=memory_mb,
             last_request=self.last_request_time
         )
+        self._status_cache = (now, response)
+        return response
+    
+    def _sample_memory_mb(self) -> Optional[float]:
+        """Read the process resident memory in MB"""
+        try:
+            return self._process.memory_info().rss / 1_048_576
+        except Exception:
+            return None
+    
+    async def _memory_sampler(self):
+        """Periodically refresh the memory usage reported by /status"""
+        while True:
+            self._memory_mb = self._sample_memory_mb()
+            await asyncio.sleep(MEMORY_SAMPLE_INTERVAL_SECONDS)
     
     # Abstract methods that agents must implement
     
@@ -315,10 +538,60 @@ class BaseAgent(ABC):
     ) -> str:
         """
         Process a chat message and return response
-        This is the main method agents must implement
+        This is the main method agents must implement.
+        Arguments come from a ChatRequest already validated by FastAPI;
+        there is no need to validate or rebuild the request again here.
         """
         pass
     
+    async def process_message_batch(self, requests: List[ChatRequest]) -> List[Any]:
+        """
+        Process a batch of chat requests, returning one result per request
+        A result may be an exception, which is raised for that request only.
+        Override to send the whole batch to a provider in a single call.
+        """
+        return await asyncio.gather(
+            *(
+                self.process_message(
+                    message=request.message,
+                    context=request.context,
+                    user_id=request.user_id,
+                    conversation_id=request.conversation_id
+                )
+                for request in requests
+            ),
+            return_exceptions=True
+        )
+    
+    def _chat_cache_key(self, request: ChatRequest) -> Optional[Tuple[Any, ...]]:
+        """Response cache key for a request, or None if its context is not hashable"""
+        try:
+            context_key = frozenset(request.context.items()) if request.context else None
+        except TypeError:
+            return None
+        return (request.message, request.user_id, context_key)
+    
+    def _is_cacheable_response(self, response_text: str) -> bool:
+        """Whether a response may be stored in the response cache"""
+        return True
+    
+    async def _dispatch_chat(self, request: ChatRequest) -> str:
+        """Hand a chat request to the agent's message processing"""
+        return await self.process_message(
+            message=request.message,
+            context=request.context,
+            user_id=request.user_id,
+            conversation_id=request.conversation_id
+        )
+    
+    async def _warmup(self):
+        """
+        Exercise request-path code once before serving traffic
+        Runs after on_startup() so the first real request doesn't pay first-use costs.
+        """
+        ChatRequest.model_validate({"message": "warmup", "context": {}})
+        await self._get_health_response()
+    
     # Optional hooks for lifecycle management
     
     async def on_startup(self):
@@ -337,18 +610,140 @@ class BaseAgent(ABC):
         return AgentStatus.HEALTHY
     
     def add_capability(self, capability: AgentCapability):
-        """Add a capability to this agent"""
+        """
+        Add a capability to this agent
+        Use this rather than mutating self.capabilities so /status picks up the change
+        """
         self.capabilities.append(capability)
+        self._capabilities_dump = None
+        self._status_cache = None
+    
+    def _get_capabilities_dump(self) -> List[Dict[str, Any]]:
+        """Serialized capability list, rebuilt only when capabilities change"""
+        if self._capabilities_dump is None:
+            self._capabilities_dump = [c.model_dump(mode="json") for c in self.capabilities]
+        return self._capabilities_dump
     
     def run(self, **uvicorn_kwargs):
-        """Run the agent with uvicorn"""
+        """
+        Run the agent with uvicorn
+        Uses the uvloop event loop and httptools parser; uvloop is not
+        available on Windows, where uvicorn's default asyncio loop is kept.
+        """
         import uvicorn
         
         default_kwargs = {
             "host": "0.0.0.0",
             "port": self.config.port,
-            "app": self.app
+            "app": self.app,
+            "loop": "uvloop" if sys.platform != "win32" else "asyncio",
+            "http": "httptools"
         }
         default_kwargs.update(uvicorn_kwargs)
         
-        uvicorn.run(**default_kwargs)
\ No newline at end of file
+        uvicorn.run(**default_kwargs)
+
+
+class BatchedChatMixin:
+    """
+    Mixin that groups concurrent /chat requests into batches
+    
+    Requests are queued and passed to process_message_batch() in groups of
+    up to config.batch_max_size, waiting at most config.batch_max_delay_ms
+    for a batch to fill. List the mixin before the agent base class:
+    
+        class MyAgent(BatchedChatMixin, BaseLLMAgent): ...
+    """
+    
+    async def on_startup(self):
+        """Start the batching loop"""
+        await super().on_startup()
+        self._batch_queue: asyncio.Queue = asyncio.Queue()
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self._batch_pending: List[Tuple[ChatRequest, asyncio.Future]] = []  # batch being filled
+        self._batch_loop_task = asyncio.create_task(self._batch_loop())
+    
+    async def on_shutdown(self):
+        """Stop the batching loop, processing the requests still waiting for a batch"""
+        loop_task = getattr(self, "_batch_loop_task", None)
+        if loop_task is not None:
+            # From here on new requests bypass the queue (see _dispatch_chat)
+            self._batch_loop_task = None
+            loop_task.cancel()
+            await asyncio.gather(loop_task, return_exceptions=True)
+            
+            # Flush the partially filled batch and anything still queued
+            pending, self._batch_pending = self._batch_pending, []
+            while not self._batch_queue.empty():
+                pending.append(self._batch_queue.get_nowait())
+            max_size = self.config.batch_max_size
+            for start in range(0, len(pending), max_size):
+                self._start_batch(pending[start:start + max_size])
+            
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+        await super().on_shutdown()
+    
+    async def _dispatch_chat(self, request: ChatRequest) -> str:
+        """Queue the request and wait for its batch to be processed"""
+        if getattr(self, "_batch_loop_task", None) is None:
+            # Batching loop not running (e.g. app used without lifespan)
+            return await super()._dispatch_chat(request)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._batch_queue.put_nowait((request, future))
+        return await future
+    
+    async def _batch_loop(self):
+        """Collect queued requests into batches and dispatch them"""
+        loop = asyncio.get_running_loop()
+        max_size = self.config.batch_max_size
+        max_delay = self.config.batch_max_delay_ms / 1000
+        
+        while True:
+            batch = self._batch_pending = [await self._batch_queue.get()]
+            deadline = loop.time() + max_delay
+            
+            while len(batch) < max_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._batch_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Run the batch in the background so the next one can fill meanwhile
+            self._batch_pending = []
+            self._start_batch(batch)
+    
+    def _start_batch(self, batch: List[Tuple[ChatRequest, asyncio.Future]]):
+        """Process a batch in a background task"""
+        task = asyncio.create_task(self._run_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, batch: List[Tuple[ChatRequest, asyncio.Future]]):
+        """Process one batch and resolve the waiting requests"""
+        try:
+            results = await self.process_message_batch([request for request, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(
+                    f"process_message_batch returned {len(results)} results for {len(batch)} requests"
+                )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            results = [e] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # Caller went away (request cancelled)
+                continue
+            if isinstance(result, asyncio.CancelledError):
+                future.cancel()
+            elif isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
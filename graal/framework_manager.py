@@ -3,23 +3,164 @@ Framework Manager for self-update capabilities
 Handles framework version management, updates, and testing
 """
 import asyncio
-import json
+import importlib.util
 import logging
 import os
+import random
+import re
 import shutil
 import subprocess
+import sys
 import tempfile
 import time
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
 
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
 import httpx
+import orjson
+from packaging.version import InvalidVersion, Version
 from pydantic import BaseModel, Field
 from .migration_manager import MigrationManager
 
 logger = logging.getLogger(__name__)
 
+# Items per page for GitHub list endpoints (API maximum)
+GITHUB_PAGE_SIZE = 100
+
+# Retries for rate-limited GitHub calls, and the longest wait we'll sleep through
+GITHUB_MAX_RETRIES = 5
+GITHUB_MAX_BACKOFF_SECONDS = 60.0
+
+# requirements.txt line pinning the framework: optionally editable / "name[extras] @", https or
+# ssh, with credentials in the URL, an #egg= fragment, an environment marker and a trailing comment.
+# "head" and "tail" are everything around the @ref, so an update only has to swap the ref.
+_FWK_RE = re.compile(
+    r'^(?P<head>\s*(?:-e\s+)?(?:[\w.-]+(?:\s*\[[^\]]*\])?\s*@\s*)?'
+    r'git\+(?:https?|ssh)://(?:[^/@\s]*@)?[^@\s#;]*hg-agent-fwk\.git)'
+    r'(?:@[^\s#;]+)?'
+    r'(?P<tail>(?:#\S*)?(?:\s*;[^#]*)?(?:\s+#.*)?\s*)$'
+)
+
+# Linux ioctl to share a file's data blocks copy-on-write (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Subprocess output kept per stream (last N lines) and max bytes per line
+OUTPUT_TAIL_LINES = 200
+SUBPROCESS_LINE_LIMIT = 1024 * 1024
+
+
+def _clone_file(src: str, dst: str) -> str:
+    """
+    Copy a file as a copy-on-write reflink when the filesystem supports it.
+    Falls back to shutil.copy2 (a regular byte copy) everywhere else.
+    """
+    if HAS_FCNTL and sys.platform.startswith("linux"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return dst
+        except OSError:
+            pass
+    return shutil.copy2(src, dst)
+
+
+def _list_files(directory: Path) -> List[str]:
+    """Names of the regular files in a directory (scandir's d_type avoids a stat per entry)"""
+    with os.scandir(directory) as entries:
+        return [entry.name for entry in entries if entry.is_file()]
+
+
+def _copy_if_exists(src: Path, dst: Path) -> bool:
+    """shutil.copy2 that skips (returns False for) a missing source file"""
+    try:
+        shutil.copy2(src, dst)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+async def _tail_stream(stream: asyncio.StreamReader) -> str:
+    """Drain a subprocess pipe line by line, keeping only the last lines"""
+    tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    async for line in stream:
+        tail.append(line.decode(errors="replace").rstrip("\n"))
+    return "\n".join(tail)
+
+
+async def _run_command(cmd: List[str], cwd: Path) -> Tuple[int, str, str]:
+    """Run a command, streaming stdout/stderr; returns (exit code, stdout tail, stderr tail)"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+        cwd=cwd,
+        limit=SUBPROCESS_LINE_LIMIT
+    )
+    try:
+        stdout, stderr = await asyncio.gather(
+            _tail_stream(process.stdout),
+            _tail_stream(process.stderr)
+        )
+    except BaseException:
+        # Reading failed (e.g. a line over SUBPROCESS_LINE_LIMIT) or we were cancelled:
+        # don't leave the child running against a pipe nobody drains
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+        raise
+    return await process.wait(), stdout, stderr
+
+
+def _rate_limit_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+    """
+    Seconds to wait before retrying a rate-limited GitHub response, or None if not rate-limited
+    Honors Retry-After / X-RateLimit-Reset, falling back to exponential backoff with jitter.
+    """
+    headers = response.headers
+    rate_limited = response.status_code == 429 or (
+        response.status_code == 403
+        and (headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in headers)
+    )
+    if not rate_limited:
+        return None
+    
+    backoff = 2 ** attempt + random.random()
+    try:
+        if "Retry-After" in headers:
+            return max(float(headers["Retry-After"]), backoff)
+        if "X-RateLimit-Reset" in headers:
+            return max(float(headers["X-RateLimit-Reset"]) - time.time(), backoff)
+    except ValueError:
+        pass
+    return backoff
+
+
+def _parse_version(version: str) -> Optional[Version]:
+    """Parse a semantic version string, or None if it isn't one"""
+    try:
+        return Version(version)
+    except InvalidVersion:
+        return None
+
+
+class GitHubRateLimitError(RuntimeError):
+    """GitHub API rate limit exceeded; retry_after is the suggested wait in seconds"""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
 
 class FrameworkVersion(BaseModel):
     """Framework version information"""
@@ -35,7 +176,9 @@ class UpdateResult(BaseModel):
     success: bool = Field(..., description="Was the update successful?")
     from_version: str = Field(..., description="Previous version")
     to_version: str = Field(..., description="New version")
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc), description="When the update ran (UTC)"
+    )
     test_results: Optional[Dict[str, Any]] = Field(None, description="Test execution results")
     rollback_available: bool = Field(default=False, description="Can rollback to previous version?")
     error_message: Optional[str] = Field(None, description="Error message if update failed")
@@ -67,20 +210,55 @@ class FrameworkManager:
         self.agent_root = Path(os.getcwd())
         self.framework_lock_file = self.agent_root / "framework.lock"
         self.backup_dir = self.agent_root / ".framework_backups"
+        self._current_version: Optional[str] = None  # cached framework.lock content
         
         # Migration manager for code updates
         self.migration_manager = MigrationManager(self.agent_root)
         
+        # Shared GitHub API client, created on first use (see _get_http_client)
+        self._http: Optional[httpx.AsyncClient] = None
+        
+        # Conditional-request cache for GitHub responses: url -> (ETag, parsed body)
+        self._etag_cache_file = self.backup_dir / "etag_cache.json"
+        self._etag_cache: Optional[Dict[str, Tuple[str, Any]]] = None
+        self._etag_cache_dirty = False
+        
+        # Test-runner modules importable by this interpreter: module -> found
+        self._module_cache: Dict[str, bool] = {}
+        
         # Ensure backup directory exists
         self.backup_dir.mkdir(exist_ok=True)
     
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the shared GitHub API client, reusing its TCP/TLS connections across calls"""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self.github_api_url,
+                http2=True,
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+                headers={"Accept": "application/vnd.github+json"},
+            )
+        return self._http
+    
+    async def aclose(self):
+        """Close the shared GitHub API client"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+    
     def get_current_version(self) -> str:
-        """Get current framework version from framework.lock"""
+        """Get current framework version from framework.lock (read once, then cached)"""
+        if self._current_version is not None:
+            return self._current_version
+        
         try:
             if self.framework_lock_file.exists():
                 version = self.framework_lock_file.read_text().strip()
-                return version.lstrip('v')  # Remove 'v' prefix if present
-            return "1.0.0"  # Default fallback
+                self._current_version = version.lstrip('v')  # Remove 'v' prefix if present
+            else:
+                self._current_version = "1.0.0"  # Default fallback
+            return self._current_version
         except Exception as e:
             logger.error(f"Error reading framework.lock: {e}")
             return "unknown"
@@ -88,46 +266,135 @@ class FrameworkManager:
     async def get_available_versions(self) -> List[FrameworkVersion]:
         """Get available framework versions from GitHub releases/tags"""
         try:
-            async with httpx.AsyncClient() as client:
-                # Get tags from GitHub API
-                response = await client.get(f"{self.github_api_url}/tags", timeout=10.0)
-                response.raise_for_status()
-                
-                tags_data = response.json()
-                versions = []
-                
-                for tag in tags_data:
-                    tag_name = tag["name"]
-                    version_str = tag_name.lstrip('v')
-                    
-                    # Try to get release info for more details
-                    release_info = await self._get_release_info(client, tag_name)
-                    
-                    versions.append(FrameworkVersion(
-                        tag=tag_name,
-                        version=version_str,
-                        release_date=release_info.get("published_at"),
-                        changelog=release_info.get("body", ""),
-                        is_prerelease=release_info.get("prerelease", False)
-                    ))
-                
-                # Sort by semantic version (newest first)
-                versions.sort(key=lambda v: v.version, reverse=True)
-                return versions
+            client = self._get_http_client()
+            
+            # Get tags and all release details concurrently (one listing each)
+            tags_data, releases = await asyncio.gather(
+                self._get_paginated(client, "/tags"),
+                self._fetch_all_releases(client),
+                return_exceptions=True
+            )
+            if isinstance(tags_data, BaseException):
+                raise tags_data
+            if isinstance(releases, GitHubRateLimitError):
+                # Rate limited, not missing: don't hand out (cacheable) tags without release info
+                raise releases
+            if isinstance(releases, BaseException):
+                logger.debug(f"No release info available: {releases}")
+                releases = {}
+            await self._save_etag_cache()
+            
+            versions = []
+            for tag in tags_data:
+                tag_name = tag["name"]
+                version_str = tag_name.lstrip('v')
+                release_info = releases.get(tag_name, {})
                 
+                versions.append(FrameworkVersion(
+                    tag=tag_name,
+                    version=version_str,
+                    release_date=release_info.get("published_at"),
+                    changelog=release_info.get("body", ""),
+                    is_prerelease=release_info.get("prerelease", False)
+                ))
+            
+            # Sort by semantic version (newest first, unparsable tags last)
+            versions.sort(key=lambda v: _parse_version(v.version) or Version("0"), reverse=True)
+            return versions
+            
+        except GitHubRateLimitError:
+            raise
         except Exception as e:
             logger.error(f"Error fetching available versions: {e}")
             return []
     
-    async def _get_release_info(self, client: httpx.AsyncClient, tag_name: str) -> Dict[str, Any]:
-        """Get release information for a specific tag"""
+    async def _fetch_all_releases(self, client: httpx.AsyncClient) -> Dict[str, Dict[str, Any]]:
+        """Get information for all releases, keyed by tag name"""
+        releases = await self._get_paginated(client, "/releases")
+        return {release["tag_name"]: release for release in releases}
+    
+    async def _get_paginated(self, client: httpx.AsyncClient, path: str) -> List[Dict[str, Any]]:
+        """Get every page of a GitHub list endpoint"""
+        items: List[Dict[str, Any]] = []
+        page = 1
+        while True:
+            page_items = await self._cached_get(client, path, {"per_page": GITHUB_PAGE_SIZE, "page": page})
+            items.extend(page_items)
+            if len(page_items) < GITHUB_PAGE_SIZE:
+                return items
+            page += 1
+    
+    async def _cached_get(
+        self,
+        client: httpx.AsyncClient,
+        path: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        GET a GitHub API path, revalidating any cached body with If-None-Match
+        A 304 Not Modified carries no body and doesn't count against the rate limit.
+        Rate-limited responses are retried with backoff; GitHubRateLimitError is
+        raised when retries run out or the limit resets too far in the future.
+        """
+        cache = await self._load_etag_cache()
+        key = f"{path}?{httpx.QueryParams(params or {})}"
+        cached = cache.get(key)
+        
+        headers = {"If-None-Match": cached[0]} if cached else None
+        for attempt in range(GITHUB_MAX_RETRIES):
+            response = await client.get(path, params=params, headers=headers)
+            delay = _rate_limit_delay(response, attempt)
+            if delay is None:
+                break
+            if delay > GITHUB_MAX_BACKOFF_SECONDS or attempt == GITHUB_MAX_RETRIES - 1:
+                raise GitHubRateLimitError(f"GitHub API rate limit exceeded for {path}", retry_after=delay)
+            logger.warning(f"GitHub rate limit hit for {path}, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        
+        if response.status_code == 304 and cached:
+            return cached[1]
+        response.raise_for_status()
+        
+        body = orjson.loads(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            cache[key] = (etag, body)
+            self._etag_cache_dirty = True
+        return body
+    
+    async def _load_etag_cache(self) -> Dict[str, Tuple[str, Any]]:
+        """Get the ETag cache, loading it from disk (off the event loop) on first use"""
+        if self._etag_cache is None:
+            cache = {}
+            try:
+                data = await asyncio.to_thread(self._read_etag_cache_file)
+                if data is not None:
+                    cache = {url: (etag, body) for url, (etag, body) in data.items()}
+            except Exception as e:
+                logger.debug(f"Ignoring unreadable ETag cache: {e}")
+            # A concurrent caller may have loaded it while we were reading
+            if self._etag_cache is None:
+                self._etag_cache = cache
+        return self._etag_cache
+    
+    def _read_etag_cache_file(self) -> Optional[Dict[str, Any]]:
+        """Parse the ETag cache file, or None if there isn't one"""
+        if not self._etag_cache_file.exists():
+            return None
+        return orjson.loads(self._etag_cache_file.read_bytes())
+    
+    async def _save_etag_cache(self):
+        """Persist the ETag cache (off the event loop) so it survives restarts"""
+        if not self._etag_cache_dirty:
+            return
+        # Serialize on the loop so the thread writes a consistent snapshot
+        payload = orjson.dumps(self._etag_cache)
+        self._etag_cache_dirty = False
         try:
-            response = await client.get(f"{self.github_api_url}/releases/tags/{tag_name}", timeout=10.0)
-            if response.status_code == 200:
-                return response.json()
+            await asyncio.to_thread(self._etag_cache_file.write_bytes, payload)
         except Exception as e:
-            logger.debug(f"No release info for tag {tag_name}: {e}")
-        return {}
+            self._etag_cache_dirty = True
+            logger.debug(f"Could not save ETag cache: {e}")
     
     async def update_framework(self, target_version: str, run_tests: bool = True) -> UpdateResult:
         """
@@ -140,10 +407,24 @@ class FrameworkManager:
         Returns:
             UpdateResult with success status and details
         """
+        # Single timestamp shared by the backup name, test results and the result
+        now = datetime.now(timezone.utc)
         current_version = self.get_current_version()
         target_tag = target_version if target_version.startswith('v') else f'v{target_version}'
         target_clean = target_version.lstrip('v')
         
+        current_parsed = _parse_version(current_version)
+        if current_parsed is not None and current_parsed == _parse_version(target_clean):
+            logger.info(f"✅ Framework already at version {current_version}, nothing to update")
+            return UpdateResult(
+                success=True,
+                from_version=current_version,
+                to_version=target_clean,
+                updated_at=now,
+                migration_applied=False,
+                migration_message=f"Framework already at version {current_version}"
+            )
+        
         logger.info(f"🔄 Starting framework update: {current_version} → {target_clean}")
         
         # Check if migration is needed
@@ -153,25 +434,30 @@ class FrameworkManager:
             logger.info(f"Breaking changes: {migration_info['breaking_changes']}")
         
         # Create backup before update
-        backup_path = await self._create_backup(current_version)
+        backup_path = await self._create_backup(current_version, now)
         
         try:
             # Update requirements.txt to point to new version
             await self._update_requirements_file(target_tag)
             
-            # Reinstall framework with new version
-            await self._reinstall_framework()
+            # Reinstall framework with new version; only pull the whole
+            # requirements set when the migration is unknown or changes deps
+            if migration_info["migration_available"] and not migration_info["dependencies_changed"]:
+                await self._reinstall_framework(target_tag)
+            else:
+                await self._reinstall_framework()
             
             # Apply code migrations if needed
             migration_result = await self.migration_manager.apply_migration(current_version, target_clean)
             
             # Update framework.lock
-            self.framework_lock_file.write_text(target_tag + "\n")
+            await asyncio.to_thread(self.framework_lock_file.write_text, target_tag + "\n")
+            self._current_version = target_clean
             
             test_results = None
             if run_tests:
                 logger.info("🧪 Running tests after framework update...")
-                test_results = await self._run_tests()
+                test_results = await self._run_tests(now)
                 
                 if not test_results.get("success", False):
                     logger.error("❌ Tests failed after update, rolling back...")
@@ -180,6 +466,7 @@ class FrameworkManager:
                         success=False,
                         from_version=current_version,
                         to_version=target_clean,
+                        updated_at=now,
                         test_results=test_results,
                         rollback_available=True,
                         error_message="Tests failed after update, automatically rolled back"
@@ -188,29 +475,19 @@ class FrameworkManager:
             logger.info(f"✅ Framework updated successfully: {current_version} → {target_clean}")
             
             # Include migration results in response
-            result = UpdateResult(
+            return UpdateResult(
                 success=True,
                 from_version=current_version,
                 to_version=target_clean,
+                updated_at=now,
                 test_results=test_results,
-                rollback_available=True
+                rollback_available=True,
+                migration_applied=migration_result.get("migration_required", False),
+                migration_changes=migration_result.get("changes_applied", []),
+                breaking_changes=migration_result.get("breaking_changes", []),
+                migration_message=migration_result.get("message", "")
             )
             
-            # Add migration info to result
-            if migration_result:
-                result_dict = result.dict()
-                result_dict.update({
-                    "migration_applied": migration_result.get("migration_required", False),
-                    "migration_changes": migration_result.get("changes_applied", []),
-                    "breaking_changes": migration_result.get("breaking_changes", []),
-                    "migration_message": migration_result.get("message", "")
-                })
-                
-                # Convert back to UpdateResult with additional fields
-                return UpdateResult(**{k: v for k, v in result_dict.items() if k in UpdateResult.__fields__})
-            
-            return result
-            
         except Exception as e:
             logger.error(f"❌ Framework update failed: {e}")
             
@@ -226,22 +503,23 @@ class FrameworkManager:
                 success=False,
                 from_version=current_version,
                 to_version=target_clean,
+                updated_at=now,
                 rollback_available=rollback_available,
                 error_message=str(e)
             )
     
-    async def _create_backup(self, version: str) -> Path:
+    async def _create_backup(self, version: str, now: datetime) -> Path:
         """Create backup of current framework configuration"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
         backup_path = self.backup_dir / f"backup_{version}_{timestamp}"
-        backup_path.mkdir(exist_ok=True)
+        await asyncio.to_thread(backup_path.mkdir, exist_ok=True)
         
-        # Backup key files
+        # Backup key files, copying them concurrently off the event loop
         files_to_backup = ["requirements.txt", "framework.lock"]
-        for filename in files_to_backup:
-            src = self.agent_root / filename
-            if src.exists():
-                shutil.copy2(src, backup_path / filename)
+        await asyncio.gather(*(
+            asyncio.to_thread(_copy_if_exists, self.agent_root / filename, backup_path / filename)
+            for filename in files_to_backup
+        ))
         
         logger.info(f"📦 Created backup at {backup_path}")
         return backup_path
@@ -250,48 +528,50 @@ class FrameworkManager:
         """Update requirements.txt to point to new framework version"""
         requirements_path = self.agent_root / "requirements.txt"
         
-        if not requirements_path.exists():
+        if not await asyncio.to_thread(requirements_path.exists):
             raise FileNotFoundError("requirements.txt not found")
         
-        content = requirements_path.read_text()
-        lines = content.split('\n')
-        
-        # Update the framework line
-        updated_lines = []
-        framework_updated = False
+        lines = (await asyncio.to_thread(requirements_path.read_text)).splitlines()
         
-        for line in lines:
-            if 'hg-agent-fwk.git' in line:
-                # Replace with new version
-                new_line = f"git+https://github.com/Holy-Bird-Animation-Studio/hg-agent-fwk.git@{target_tag}"
-                updated_lines.append(new_line)
-                framework_updated = True
-                logger.info(f"📝 Updated framework line: {new_line}")
-            else:
-                updated_lines.append(line)
+        # Re-pin the framework line, keeping its name, extras, URL and marker
+        updated_lines = [
+            _FWK_RE.sub(lambda m: f"{m['head']}@{target_tag}{m['tail']}", line) for line in lines
+        ]
+        framework_lines = [line for line in updated_lines if _FWK_RE.match(line)]
         
-        if not framework_updated:
+        if not framework_lines:
             raise ValueError("Framework line not found in requirements.txt")
+        logger.info(f"📝 Updated framework line: {framework_lines[0]}")
         
-        requirements_path.write_text('\n'.join(updated_lines))
+        await asyncio.to_thread(requirements_path.write_text, '\n'.join(updated_lines) + '\n')
     
-    async def _reinstall_framework(self):
-        """Reinstall framework from updated requirements.txt"""
+    def _framework_spec(self, target_tag: str) -> str:
+        """pip requirement spec for a given framework tag"""
+        return f"git+{self.github_repo_url}@{target_tag}"
+    
+    async def _reinstall_framework(self, target_tag: Optional[str] = None):
+        """
+        Reinstall framework
+        
+        With target_tag, only the framework package is reinstalled (its
+        dependencies are left alone); otherwise everything in requirements.txt is.
+        """
         logger.info("📦 Reinstalling framework...")
         
+        if target_tag:
+            pip_args = ["install", "--upgrade", "--force-reinstall", "--no-deps", self._framework_spec(target_tag)]
+        else:
+            pip_args = ["install", "--force-reinstall", "-r", "requirements.txt"]
+        
         try:
-            # Run pip install in subprocess
-            process = await asyncio.create_subprocess_exec(
-                "pip", "install", "--force-reinstall", "-r", "requirements.txt",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-                cwd=self.agent_root
+            # Run pip install in subprocess, with this interpreter's pip
+            returncode, _, stderr = await _run_command(
+                [sys.executable, "-m", "pip", *pip_args],
+                self.agent_root
             )
             
-            stdout, stderr = await process.communicate()
-            
-            if process.returncode != 0:
-                error_msg = stderr.decode() if stderr else "Unknown pip error"
+            if returncode != 0:
+                error_msg = stderr or "Unknown pip error"
                 raise RuntimeError(f"pip install failed: {error_msg}")
             
             logger.info("✅ Framework reinstalled successfully")
@@ -300,75 +580,72 @@ class FrameworkManager:
             logger.error(f"❌ Failed to reinstall framework: {e}")
             raise
     
-    async def _run_tests(self) -> Dict[str, Any]:
-        """Run tests and return results"""
+    async def _run_tests(self, now: datetime) -> Dict[str, Any]:
+        """Run tests and return results (stamped with the update's timestamp)"""
+        timestamp = now.isoformat()
         try:
-            # Look for test command or files
-            test_commands = [
-                ["python", "-m", "pytest", "tests/", "-v"],
-                ["python", "-m", "pytest", ".", "-v"],
-                ["python", "test_agent.py"],
-            ]
+            # Pick a single test command based on what is installed / present
+            has_pytest = self._module_available("pytest")
+            if has_pytest and (self.agent_root / "tests").is_dir():
+                cmd = [sys.executable, "-m", "pytest", "tests/", "-v"]
+            elif has_pytest:
+                cmd = [sys.executable, "-m", "pytest", ".", "-v"]
+            elif (self.agent_root / "test_agent.py").exists():
+                cmd = [sys.executable, "test_agent.py"]
+            else:
+                cmd = None
             
-            for cmd in test_commands:
-                if await self._command_exists(cmd[0]):
-                    logger.info(f"🧪 Running tests: {' '.join(cmd)}")
-                    
-                    process = await asyncio.create_subprocess_exec(
-                        *cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        cwd=self.agent_root
-                    )
-                    
-                    stdout, stderr = await process.communicate()
-                    
-                    return {
-                        "success": process.returncode == 0,
-                        "command": ' '.join(cmd),
-                        "exit_code": process.returncode,
-                        "stdout": stdout.decode(),
-                        "stderr": stderr.decode(),
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
+            if cmd:
+                logger.info(f"🧪 Running tests: {' '.join(cmd)}")
+                
+                returncode, stdout, stderr = await _run_command(cmd, self.agent_root)
+                
+                return {
+                    "success": returncode == 0,
+                    "command": ' '.join(cmd),
+                    "exit_code": returncode,
+                    "stdout": stdout,
+                    "stderr": stderr,
+                    "timestamp": timestamp
+                }
             
             # No test command found
             return {
                 "success": True,  # Assume OK if no tests
                 "message": "No test command found, skipping tests",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": timestamp
             }
             
         except Exception as e:
             return {
                 "success": False,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": timestamp
             }
     
-    async def _command_exists(self, command: str) -> bool:
-        """Check if a command exists"""
-        try:
-            process = await asyncio.create_subprocess_exec(
-                "which", command,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE
-            )
-            await process.communicate()
-            return process.returncode == 0
-        except:
-            return False
+    def _module_available(self, module: str) -> bool:
+        """Check if sys.executable can import a module, i.e. run it with -m (cached for the process lifetime)"""
+        exists = self._module_cache.get(module)
+        if exists is None:
+            exists = importlib.util.find_spec(module) is not None
+            self._module_cache[module] = exists
+        return exists
     
     async def _rollback_from_backup(self, backup_path: Path):
         """Rollback framework from backup"""
         logger.info(f"🔄 Rolling back from backup: {backup_path}")
         
-        # Restore files from backup
-        for backup_file in backup_path.iterdir():
-            if backup_file.is_file():
-                dest = self.agent_root / backup_file.name
-                shutil.copy2(backup_file, dest)
-                logger.info(f"📋 Restored {backup_file.name}")
+        # Restore files from backup concurrently (reflinked where possible)
+        backup_files = await asyncio.to_thread(_list_files, backup_path)
+        await asyncio.gather(*(
+            asyncio.to_thread(_clone_file, backup_path / name, self.agent_root / name)
+            for name in backup_files
+        ))
+        for name in backup_files:
+            logger.info(f"📋 Restored {name}")
+        
+        # framework.lock may have been restored; re-read it on next access
+        self._current_version = None
         
         # Reinstall framework from restored requirements.txt
         await self._reinstall_framework()
@@ -387,10 +664,16 @@ class FrameworkManager:
         
         clone_path = self.agent_root.parent / clone_name
         
-        # Copy entire agent directory
-        shutil.copytree(self.agent_root, clone_path, ignore=shutil.ignore_patterns(
-            '__pycache__', '*.pyc', '.pytest_cache', '.framework_backups', '*.log'
-        ))
+        # Copy entire agent directory (reflinked where possible), off the event loop
+        await asyncio.to_thread(
+            shutil.copytree,
+            self.agent_root,
+            clone_path,
+            ignore=shutil.ignore_patterns(
+                '__pycache__', '*.pyc', '.pytest_cache', '.framework_backups', '*.log'
+            ),
+            copy_function=_clone_file
+        )
         
         logger.info(f"🔬 Created test clone: {clone_path}")
         return clone_path
\ No newline at end of file
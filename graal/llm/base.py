@@ -2,7 +2,8 @@
 Base LLM-enabled agent class
 Extends BaseAgent with LLM capabilities
 """
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, ClassVar, Optional, Set, Tuple
 from ..base import BaseAgent, AgentConfig
 from ..models import AgentCapability
 from .client import LLMClient, LLMConfig
@@ -18,6 +19,9 @@ class BaseLLMAgent(BaseAgent):
     - Automatic LLM capability registration
     """
     
+    # (provider, model) pairs whose connection test already succeeded in this process
+    _startup_probe_done: ClassVar[Set[Tuple[str, str]]] = set()
+    
     def __init__(self, config: AgentConfig, llm_config: Optional[LLMConfig] = None):
         super().__init__(config)
         
@@ -25,6 +29,13 @@ class BaseLLMAgent(BaseAgent):
         self.llm_config = llm_config or LLMConfig.from_env()
         self.llm_client = LLMClient(self.llm_config)
         
+        # Rendered system prompt, built once (see get_system_prompt)
+        self._system_prompt: Optional[str] = None
+        self._fallback_response = (
+            f"I apologize, but I'm experiencing technical difficulties. As {self.config.name}, "
+            "I'm temporarily unable to process your request. Please try again later."
+        )
+        
         # Register LLM capabilities
         self._register_llm_capabilities()
     
@@ -49,7 +60,8 @@ class BaseLLMAgent(BaseAgent):
     def get_system_prompt(self) -> str:
         """
         Get system prompt for this agent
-        Override this method to customize the agent's behavior
+        Override this method to customize the agent's behavior.
+        The prompt is rendered once at startup and reused for every message.
         """
         return f"""You are {self.config.name}, a specialized AI assistant.
 
@@ -85,8 +97,10 @@ Guidelines:
                 "conversation_id": conversation_id
             }
             
-            # Get system prompt
-            system_prompt = self.get_system_prompt()
+            # Get system prompt (rendered once, see on_startup)
+            if self._system_prompt is None:
+                self._system_prompt = self.get_system_prompt()
+            system_prompt = self._system_prompt
             
             # Call LLM
             response = await self.llm_client.chat(
@@ -98,24 +112,44 @@ Guidelines:
             return response
             
         except Exception as e:
-            self.logger.error(f"LLM processing error: {e}")
+            self.logger.error("LLM processing error: %s", e)
             
             # Fallback response
-            return f"I apologize, but I'm experiencing technical difficulties. As {self.config.name}, I'm temporarily unable to process your request. Please try again later."
+            return self._fallback_response
+    
+    def _is_cacheable_response(self, response_text: str) -> bool:
+        """Never cache the technical-difficulties fallback"""
+        return response_text is not self._fallback_response
     
     async def on_startup(self):
         """Extended startup for LLM agents"""
         await super().on_startup()
+        self._system_prompt = self.get_system_prompt()
+        
+        # Test LLM connection once per provider/model (it is a billed request)
+        probe_key = (self.llm_config.provider.value, self.llm_config.get_model_name())
+        if os.getenv("GRAAL_SKIP_LLM_PROBE") or probe_key in BaseLLMAgent._startup_probe_done:
+            return
         
-        # Test LLM connection
         try:
             test_response = await self.llm_client.chat(
                 "Hello", 
                 "Respond with just 'OK' to confirm connection."
             )
-            self.logger.info(f"LLM connection test successful: {test_response[:20]}...")
+            BaseLLMAgent._startup_probe_done.add(probe_key)
+            self.logger.info("LLM connection test successful: %.20s...", test_response)
         except Exception as e:
-            self.logger.warning(f"LLM connection test failed: {e}")
+            self.logger.warning("LLM connection test failed: %s", e)
+    
+    async def _warmup(self):
+        """Extended warm-up for LLM agents: load the provider SDK client"""
+        await super()._warmup()
+        self.llm_client.warmup()
+    
+    async def on_shutdown(self):
+        """Extended shutdown for LLM agents: close the SDK client after pending work"""
+        await super().on_shutdown()
+        await self.llm_client.aclose()
     
     def get_llm_info(self) -> Dict[str, Any]:
         """Get current LLM configuration info"""
@@ -4,10 +4,13 @@ Supports multiple providers with unified interface
 """
 import os
 import asyncio
-from typing import Dict, Any, List, Optional, Union
+import weakref
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Tuple, Union
 from enum import Enum
 from abc import ABC, abstractmethod
 
+import httpx
 from pydantic import BaseModel, Field
 
 
@@ -17,6 +20,63 @@ class LLMProvider(str, Enum):
     OPENAI = "openai"
 
 
+# Default model mappings: provider -> tier -> model name
+_MODELS: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "anthropic": MappingProxyType({
+        "fast": "claude-3-haiku-20240307",
+        "smart": "claude-3-sonnet-20240229",
+        "premium": "claude-3-opus-20240229"
+    }),
+    "openai": MappingProxyType({
+        "fast": "gpt-3.5-turbo",
+        "smart": "gpt-4-turbo-preview", 
+        "premium": "gpt-4"
+    })
+})
+
+# SDK clients shared by every provider instance using the same credentials,
+# so all agents in a process reuse one connection pool per API. A pool is bound
+# to the event loop it was opened on, so clients are kept per running loop.
+_client_cache: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[LLMProvider, str], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _create_http_client(sdk) -> httpx.AsyncClient:
+    """HTTP/2 connection pool handed to a provider SDK (keeping the SDK's timeout/redirect defaults)"""
+    http_client_cls = getattr(sdk, "DefaultAsyncHttpxClient", httpx.AsyncClient)
+    return http_client_cls(
+        http2=True,
+        limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+    )
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """The running event loop, or None when called outside of one"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _shared_client(loop: Optional[asyncio.AbstractEventLoop], provider: LLMProvider, api_key: str, create):
+    """Get the SDK client for these credentials on the given loop, creating it if missing or closed"""
+    # Outside a loop there is nothing to share the pool with
+    clients = _client_cache.setdefault(loop, {}) if loop is not None else {}
+    client = clients.get((provider, api_key))
+    if client is None or client.is_closed():
+        client = clients[(provider, api_key)] = create()
+    return client
+
+
+async def _close_shared_client(provider: LLMProvider, api_key: str):
+    """Close and forget the SDK client for these credentials on the running loop"""
+    clients = _client_cache.get(asyncio.get_running_loop())
+    client = clients.pop((provider, api_key), None) if clients else None
+    if client is not None:
+        await client.close()
+
+
 class LLMConfig(BaseModel):
     """Configuration for LLM client"""
     provider: LLMProvider = Field(default=LLMProvider.ANTHROPIC)
@@ -29,19 +89,8 @@ class LLMConfig(BaseModel):
     anthropic_api_key: Optional[str] = Field(default=None)
     openai_api_key: Optional[str] = Field(default=None)
     
-    # Model mappings
-    models: Dict[str, Dict[str, str]] = Field(default_factory=lambda: {
-        "anthropic": {
-            "fast": "claude-3-haiku-20240307",
-            "smart": "claude-3-sonnet-20240229",
-            "premium": "claude-3-opus-20240229"
-        },
-        "openai": {
-            "fast": "gpt-3.5-turbo",
-            "smart": "gpt-4-turbo-preview", 
-            "premium": "gpt-4"
-        }
-    })
+    # Model mappings (None uses the built-in defaults in _MODELS)
+    models: Optional[Dict[str, Dict[str, str]]] = Field(default=None)
     
     @classmethod
     def from_env(cls) -> "LLMConfig":
@@ -57,7 +106,8 @@ class LLMConfig(BaseModel):
     
     def get_model_name(self) -> str:
         """Get the actual model name for current config"""
-        return self.models.get(self.provider.value, {}).get(
+        models = self.models if self.models is not None else _MODELS
+        return models.get(self.provider.value, {}).get(
             self.model_tier, 
             "claude-3-haiku-20240307"
         )
@@ -86,6 +136,14 @@ class BaseLLMProvider(ABC):
     ) -> str:
         """Send chat message and get response"""
         pass
+    
+    def warmup(self):
+        """Prepare the provider ahead of the first request"""
+        pass
+    
+    async def aclose(self):
+        """Release the provider's connections"""
+        pass
 
 
 class AnthropicProvider(BaseLLMProvider):
@@ -94,19 +152,34 @@ class AnthropicProvider(BaseLLMProvider):
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
     
     def _get_client(self):
-        """Lazy initialization of Anthropic client"""
-        if self.client is None:
+        """Lazy initialization of Anthropic client (one per event loop)"""
+        loop = _running_loop()
+        if self.client is None or self._client_loop is not loop or self.client.is_closed():
             try:
                 import anthropic
-                self.client = anthropic.AsyncAnthropic(
-                    api_key=self.config.get_api_key()
-                )
             except ImportError:
                 raise ImportError("anthropic package not installed. Install with: pip install anthropic")
+            api_key = self.config.get_api_key()
+            self.client = _shared_client(
+                loop, LLMProvider.ANTHROPIC, api_key,
+                lambda: anthropic.AsyncAnthropic(api_key=api_key, http_client=_create_http_client(anthropic))
+            )
+            self._client_loop = loop
         return self.client
     
+    def warmup(self):
+        """Import the SDK and create the client before the first request"""
+        self._get_client()
+    
+    async def aclose(self):
+        """Close the shared Anthropic client for the running loop"""
+        if self.client is not None:
+            self.client = self._client_loop = None
+            await _close_shared_client(LLMProvider.ANTHROPIC, self.config.get_api_key())
+    
     async def chat(
         self, 
         message: str, 
@@ -139,19 +212,34 @@ class OpenAIProvider(BaseLLMProvider):
     def __init__(self, config: LLMConfig):
         super().__init__(config)
         self.client = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
     
     def _get_client(self):
-        """Lazy initialization of OpenAI client"""
-        if self.client is None:
+        """Lazy initialization of OpenAI client (one per event loop)"""
+        loop = _running_loop()
+        if self.client is None or self._client_loop is not loop or self.client.is_closed():
             try:
                 import openai
-                self.client = openai.AsyncOpenAI(
-                    api_key=self.config.get_api_key()
-                )
             except ImportError:
                 raise ImportError("openai package not installed. Install with: pip install openai")
+            api_key = self.config.get_api_key()
+            self.client = _shared_client(
+                loop, LLMProvider.OPENAI, api_key,
+                lambda: openai.AsyncOpenAI(api_key=api_key, http_client=_create_http_client(openai))
+            )
+            self._client_loop = loop
         return self.client
     
+    def warmup(self):
+        """Import the SDK and create the client before the first request"""
+        self._get_client()
+    
+    async def aclose(self):
+        """Close the shared OpenAI client for the running loop"""
+        if self.client is not None:
+            self.client = self._client_loop = None
+            await _close_shared_client(LLMProvider.OPENAI, self.config.get_api_key())
+    
     async def chat(
         self, 
         message: str, 
@@ -236,6 +324,14 @@ class LLMClient:
         except Exception as e:
             raise Exception(f"LLM error: {str(e)}")
     
+    def warmup(self):
+        """Initialize the provider client ahead of the first request"""
+        self.provider.warmup()
+    
+    async def aclose(self):
+        """Close the provider's connection pool"""
+        await self.provider.aclose()
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about current model configuration"""
         return {
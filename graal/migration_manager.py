@@ -2,28 +2,138 @@
 Migration Manager for GRAAL Agent Framework
 Handles automatic code migrations when upgrading framework versions
 """
+import asyncio
 import logging
+import mmap
+import os
 import re
+import shutil
+import time
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple
-from dataclasses import dataclass
-from datetime import datetime
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
+from itertools import groupby
 
 logger = logging.getLogger(__name__)
 
+_REGEX_QUANTIFIERS = "*?{"
 
-@dataclass
+# Largest backup (total bytes) also kept in memory for a fast same-process rollback
+MIGRATION_SNAPSHOT_MAX_BYTES = 1024 * 1024
+
+
+def _literal_prefilter(pattern: str) -> bytes:
+    """
+    Longest literal substring that every match of a regex must contain
+    Conservative: returns b"" (no prefilter) for alternations, inline groups/flags
+    and anything it doesn't understand. Optional (quantified) atoms are dropped.
+    """
+    if "|" in pattern or "(?" in pattern:
+        return b""
+    
+    runs: List[str] = []  # finished literal runs
+    current: List[str] = []
+    group_starts: List[int] = []  # len(runs) at each open group
+    
+    def end_run():
+        if current:
+            runs.append("".join(current))
+            current.clear()
+    
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        quantified = i + 1 < n and pattern[i + 1] in _REGEX_QUANTIFIERS
+        
+        if char == "\\" and i + 1 < n:
+            escaped = pattern[i + 1]
+            quantified = i + 2 < n and pattern[i + 2] in _REGEX_QUANTIFIERS
+            i += 2
+            if escaped.isalnum() or escaped == "_":
+                end_run()  # class (\d, \s, ...), anchor (\b) or backreference
+                continue
+            char = escaped
+        elif char == "[":
+            end_run()
+            # Skip to the end of the character class
+            i += 2 if pattern[i + 1:i + 2] == "^" else 1
+            i += 1 if pattern[i:i + 1] == "]" else 0
+            while i < n and pattern[i] != "]":
+                i += 2 if pattern[i] == "\\" else 1
+            i += 1
+            continue
+        elif char == "(":
+            end_run()
+            group_starts.append(len(runs))
+            i += 1
+            continue
+        elif char == ")":
+            end_run()
+            start = group_starts.pop() if group_starts else 0
+            if quantified:
+                del runs[start:]  # the whole group may be absent
+            i += 1
+            continue
+        elif char in ".^$":
+            end_run()
+            i += 1
+            continue
+        elif char in "*+?{}":
+            # Quantifier (its atom was already handled); skip {m,n} bounds
+            end_run()
+            if char == "{":
+                closing = pattern.find("}", i)
+                i = closing if closing != -1 else n
+            i += 1
+            continue
+        else:
+            i += 1
+        
+        # char is a literal
+        if quantified:
+            end_run()  # optional / repeated: can't be part of a contiguous run
+        elif i < n and pattern[i] == "+":
+            current.append(char)
+            end_run()  # at least once, but repeats break contiguity
+        else:
+            current.append(char)
+    end_run()
+    
+    return max(runs, key=len, default="").encode()
+
+
+@dataclass(slots=True, frozen=True)
 class MigrationStep:
-    """Single migration step"""
+    r"""
+    Single migration step
+    Patterns are compiled as bytes and matched against the raw file contents, so
+    \w, \s and \d are ASCII-only and CRLF line endings are not normalised ($ does
+    not match before \r). Non-ASCII search patterns are rejected.
+    """
     name: str
     description: str
     file_pattern: str  # Glob pattern for files to modify
     search_pattern: str  # Regex pattern to find
     replace_pattern: str  # Replacement pattern
     required: bool = True  # If False, migration failure won't block update
+    _compiled: re.Pattern = field(init=False, repr=False, compare=False)
+    _replacement: bytes = field(init=False, repr=False, compare=False)
+    literal_prefilter: bytes = field(init=False, repr=False, compare=False)  # Must appear in any match
+    
+    def __post_init__(self):
+        # A non-ASCII literal would become several UTF-8 bytes, silently changing
+        # what quantifiers and character classes apply to
+        if not self.search_pattern.isascii():
+            raise ValueError(f"Migration step {self.name!r}: search_pattern must be ASCII (it is matched as bytes)")
+        # Compile once (as bytes patterns, so files are scanned without decoding);
+        # steps are applied to every matching file
+        object.__setattr__(self, "_compiled", re.compile(self.search_pattern.encode(), re.MULTILINE))
+        object.__setattr__(self, "_replacement", self.replace_pattern.encode())
+        object.__setattr__(self, "literal_prefilter", _literal_prefilter(self.search_pattern))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class FrameworkMigration:
     """Complete migration between framework versions"""
     from_version: str
@@ -31,11 +141,7 @@ class FrameworkMigration:
     breaking_changes: List[str]
     migration_steps: List[MigrationStep]
     changelog: str = ""
-    
-    def is_compatible(self, current_version: str, target_version: str) -> bool:
-        """Check if this migration applies to the version transition"""
-        return (self.from_version == current_version and 
-                self.to_version == target_version)
+    dependencies_changed: bool = False  # If True, update reinstalls all requirements
 
 
 class MigrationManager:
@@ -51,12 +157,19 @@ class MigrationManager:
     
     def __init__(self, agent_root: Path):
         self.agent_root = Path(agent_root)
-        self.migrations = self._load_migrations()
+        # get_migration_info results per (current, target); migrations never change after load
+        self._cached_migration_info = lru_cache(maxsize=64)(self._build_migration_info)
         self.backup_dir = self.agent_root / ".migration_backups"
         self.backup_dir.mkdir(exist_ok=True)
     
-    def _load_migrations(self) -> List[FrameworkMigration]:
-        """Load all available migrations"""
+    @cached_property
+    def _migration_index(self) -> Dict[Tuple[str, str], FrameworkMigration]:
+        """Migrations keyed by (from_version, to_version)"""
+        return {(m.from_version, m.to_version): m for m in self.migrations}
+    
+    @cached_property
+    def migrations(self) -> List[FrameworkMigration]:
+        """All available migrations (built on first use)"""
         return [
             # Migration v1.0.0 → v1.1.0
             FrameworkMigration(
@@ -95,7 +208,8 @@ class MigrationManager:
                 migration_steps=[
                     # No breaking changes for v1.2.0, just new features
                 ],
-                changelog="Added self-update system with /fwk/* endpoints. No code changes required for existing agents."
+                changelog="Added self-update system with /fwk/* endpoints. No code changes required for existing agents.",
+                dependencies_changed=True
             ),
             
             # Migration v1.2.0 → v1.3.0 (future example)
@@ -127,10 +241,7 @@ class MigrationManager:
     
     def find_migration(self, current_version: str, target_version: str) -> Optional[FrameworkMigration]:
         """Find migration for version transition"""
-        for migration in self.migrations:
-            if migration.is_compatible(current_version, target_version):
-                return migration
-        return None
+        return self._migration_index.get((current_version, target_version))
     
     def has_breaking_changes(self, current_version: str, target_version: str) -> bool:
         """Check if migration has breaking changes requiring code updates"""
@@ -166,18 +277,21 @@ class MigrationManager:
         logger.info(f"🔄 Applying migration {current_version} → {target_version}")
         logger.info(f"Breaking changes: {migration.breaking_changes}")
         
+        # Glob results for this migration run: file_pattern -> matching paths
+        glob_cache: Dict[str, List[Path]] = {}
+        
         # Create backup before migration
-        backup_path = await self._create_migration_backup(current_version, target_version)
+        backup_path, snapshot = await self._create_migration_backup(migration, glob_cache)
         
         applied_changes = []
         failed_steps = []
         
         try:
-            for step in migration.migration_steps:
+            step_results = await self._apply_migration_steps(migration.migration_steps, glob_cache)
+            
+            for step, success, details in step_results:
                 logger.info(f"  📝 Applying: {step.description}")
                 
-                success, details = await self._apply_migration_step(step)
-                
                 if success:
                     applied_changes.append({
                         "step": step.name,
@@ -195,7 +309,7 @@ class MigrationManager:
                     
                     if step.required:
                         # Rollback on required step failure
-                        await self._rollback_migration(backup_path)
+                        await self._rollback_migration(backup_path, snapshot)
                         return {
                             "success": False,
                             "migration_required": True,
@@ -217,7 +331,7 @@ class MigrationManager:
             
         except Exception as e:
             logger.error(f"❌ Migration failed with exception: {e}")
-            await self._rollback_migration(backup_path)
+            await self._rollback_migration(backup_path, snapshot)
             return {
                 "success": False,
                 "migration_required": True,
@@ -225,78 +339,149 @@ class MigrationManager:
                 "rollback_performed": True
             }
     
-    async def _apply_migration_step(self, step: MigrationStep) -> Tuple[bool, str]:
-        """Apply single migration step"""
-        try:
-            # Find files matching pattern
-            files_to_modify = list(self.agent_root.glob(step.file_pattern))
-            
-            if not files_to_modify:
-                return False, f"No files found matching pattern: {step.file_pattern}"
-            
-            modifications = []
-            
-            for file_path in files_to_modify:
-                if not file_path.is_file():
-                    continue
-                    
-                content = file_path.read_text()
+    def _glob(self, file_pattern: str, glob_cache: Dict[str, List[Path]]) -> List[Path]:
+        """Files matching a pattern under the agent root, resolved once per migration run"""
+        files = glob_cache.get(file_pattern)
+        if files is None:
+            files = glob_cache[file_pattern] = list(self.agent_root.glob(file_pattern))
+        return files
+    
+    async def _apply_migration_steps(
+        self,
+        steps: List[MigrationStep],
+        glob_cache: Dict[str, List[Path]]
+    ) -> List[Tuple[MigrationStep, bool, str]]:
+        """
+        Apply migration steps, returning (step, success, details) in step order
+        Consecutive steps sharing a file_pattern are applied together, so each
+        target file is read and written once rather than once per step.
+        """
+        outcomes: List[Tuple[bool, str]] = []
+        for file_pattern, group in groupby(steps, key=lambda step: step.file_pattern):
+            bucket = list(group)
+            try:
+                # Find files matching pattern
+                files_to_modify = self._glob(file_pattern, glob_cache)
                 
-                # Apply regex transformation
-                new_content = re.sub(
-                    step.search_pattern,
-                    step.replace_pattern,
-                    content,
-                    flags=re.MULTILINE
-                )
+                if not files_to_modify:
+                    outcomes.extend(
+                        (False, f"No files found matching pattern: {file_pattern}") for _ in bucket
+                    )
+                    continue
                 
-                if new_content != content:
-                    file_path.write_text(new_content)
-                    modifications.append(str(file_path.relative_to(self.agent_root)))
-            
-            if modifications:
-                return True, f"Modified files: {', '.join(modifications)}"
-            else:
-                return True, "No changes needed (patterns already up to date)"
+                # Rewrite matching files concurrently, off the event loop
+                file_results = await asyncio.gather(*(
+                    asyncio.to_thread(self._rewrite_file, file_path, bucket)
+                    for file_path in files_to_modify
+                ))
                 
-        except Exception as e:
-            return False, f"Error applying step: {str(e)}"
+                for index in range(len(bucket)):
+                    modifications = [path for path, hits in file_results if hits[index]]
+                    if modifications:
+                        outcomes.append((True, f"Modified files: {', '.join(modifications)}"))
+                    else:
+                        outcomes.append((True, "No changes needed (patterns already up to date)"))
+                    
+            except Exception as e:
+                outcomes.extend((False, f"Error applying step: {str(e)}") for _ in bucket)
+        
+        return [(step, *outcome) for step, outcome in zip(steps, outcomes)]
     
-    async def _create_migration_backup(self, current_version: str, target_version: str) -> Path:
-        """Create backup before migration"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_path = self.backup_dir / f"migration_{current_version}_to_{target_version}_{timestamp}"
+    def _rewrite_file(self, file_path: Path, steps: List[MigrationStep]) -> Tuple[str, List[bool]]:
+        """
+        Apply steps in order to one file, writing it once if any of them matched
+        Returns the file's relative path and, per step, whether it changed the file.
+        """
+        relative_path = str(file_path.relative_to(self.agent_root))
+        hits = [False] * len(steps)
+        if not file_path.is_file():
+            return relative_path, hits
+        
+        with open(file_path, "rb") as f:
+            # mmap can't map empty files (and there is nothing to migrate in them)
+            if os.fstat(f.fileno()).st_size == 0:
+                return relative_path, hits
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                # Until a step matches the file is unchanged: scan the mapping, copying nothing
+                first = next((i for i, step in enumerate(steps) if self._step_matches(step, mapped)), None)
+                if first is None:
+                    return relative_path, hits
+                content = mapped[:]
+        
+        for index in range(first, len(steps)):
+            step = steps[index]
+            if index == first or self._step_matches(step, content):
+                # Apply regex transformation (a match always rewrites for migration patterns)
+                content = step._compiled.sub(step._replacement, content)
+                hits[index] = True
+        
+        file_path.write_bytes(content)
+        return relative_path, hits
+    
+    @staticmethod
+    def _step_matches(step: MigrationStep, data) -> bool:
+        """Cheap substring check first, then the regex: False for already-migrated files"""
+        return (
+            (not step.literal_prefilter or data.find(step.literal_prefilter) != -1)
+            and step._compiled.search(data) is not None
+        )
+    
+    async def _create_migration_backup(
+        self,
+        migration: FrameworkMigration,
+        glob_cache: Dict[str, List[Path]]
+    ) -> Tuple[Path, Optional[Dict[Path, bytes]]]:
+        """
+        Create backup of the files this migration can modify (plus framework.lock)
+        Returns the backup directory and, for small backups, an in-memory
+        snapshot (relative path -> content) so rollback doesn't re-read the disk.
+        """
+        timestamp = f"{time.time_ns():x}"  # unique even for back-to-back runs
+        backup_path = self.backup_dir / f"migration_{migration.from_version}_to_{migration.to_version}_{timestamp}"
         backup_path.mkdir(exist_ok=True)
         
-        # Backup key agent files
-        files_to_backup = [
-            "app/main.py",
-            "requirements.txt", 
-            "framework.lock",
-            "CLAUDE.md"
-        ]
+        # Backup the files targeted by the migration steps
+        files_to_backup = {self.agent_root / "framework.lock"}
+        for step in migration.migration_steps:
+            files_to_backup.update(self._glob(step.file_pattern, glob_cache))
         
-        for file_name in files_to_backup:
-            src_file = self.agent_root / file_name
-            if src_file.exists():
-                dst_file = backup_path / file_name
+        snapshot: Optional[Dict[Path, bytes]] = {}
+        snapshot_size = 0
+        for src_file in files_to_backup:
+            if src_file.is_file():
+                relative_path = src_file.relative_to(self.agent_root)
+                content = src_file.read_bytes()
+                dst_file = backup_path / relative_path
                 dst_file.parent.mkdir(parents=True, exist_ok=True)
-                dst_file.write_text(src_file.read_text())
+                dst_file.write_bytes(content)
+                
+                if snapshot is not None:
+                    snapshot_size += len(content)
+                    snapshot[relative_path] = content
+                    if snapshot_size > MIGRATION_SNAPSHOT_MAX_BYTES:
+                        snapshot = None  # too big to hold; rollback reads the disk copy
         
         logger.info(f"📦 Created migration backup: {backup_path}")
-        return backup_path
+        return backup_path, snapshot
     
-    async def _rollback_migration(self, backup_path: Path):
-        """Rollback migration from backup"""
+    async def _rollback_migration(self, backup_path: Path, snapshot: Optional[Dict[Path, bytes]] = None):
+        """Rollback migration from the in-memory snapshot, or from the backup on disk"""
         logger.info(f"🔄 Rolling back migration from {backup_path}")
         
         try:
-            for backup_file in backup_path.rglob("*"):
-                if backup_file.is_file():
-                    relative_path = backup_file.relative_to(backup_path)
+            if snapshot is not None:
+                for relative_path, content in snapshot.items():
                     target_file = self.agent_root / relative_path
                     target_file.parent.mkdir(parents=True, exist_ok=True)
-                    target_file.write_text(backup_file.read_text())
+                    target_file.write_bytes(content)
+            else:
+                # Copy the backed-up files back one by one (copytree would also
+                # copystat every directory, agent root included)
+                for dirpath, _, filenames in os.walk(backup_path):
+                    target_dir = self.agent_root / Path(dirpath).relative_to(backup_path)
+                    target_dir.mkdir(parents=True, exist_ok=True)
+                    for filename in filenames:
+                        shutil.copyfile(os.path.join(dirpath, filename), target_dir / filename)
             
             logger.info("✅ Migration rollback completed")
             
@@ -305,7 +490,14 @@ class MigrationManager:
             raise
     
     def get_migration_info(self, current_version: str, target_version: str) -> Dict[str, Any]:
-        """Get information about migration without applying it"""
+        """
+        Get information about migration without applying it
+        The returned dict is cached and shared between callers; don't mutate it.
+        """
+        return self._cached_migration_info(current_version, target_version)
+    
+    def _build_migration_info(self, current_version: str, target_version: str) -> Dict[str, Any]:
+        """Build the get_migration_info payload"""
         migration = self.find_migration(current_version, target_version)
         
         if migration is None:
@@ -329,5 +521,10 @@ class MigrationManager:
                 for step in migration.migration_steps
             ],
             "changelog": migration.changelog,
-            "has_code_changes": len(migration.migration_steps) > 0
-        }
\ No newline at end of file
+            "has_code_changes": len(migration.migration_steps) > 0,
+            "dependencies_changed": migration.dependencies_changed
+        }
+    
+    def get_migration_infos(self, current_version: str, target_versions: List[str]) -> List[Dict[str, Any]]:
+        """Get migration information for several target versions, in the same order"""
+        return [self.get_migration_info(current_version, target) for target in target_versions]
\ No newline at end of file
@@ -2,10 +2,15 @@
 Common Pydantic models for GRAAL agents
 Standardized request/response models used across all agents
 """
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+def _utcnow() -> datetime:
+    """Current time as a naive UTC datetime (datetime.utcnow() without the deprecation)"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
 
 
 class AgentStatus(str, Enum):
@@ -22,17 +27,16 @@ class HealthResponse(BaseModel):
     agent_slug: str
     version: str = "1.0.0"
     framework_version: str = Field(default="1.0.0", description="GRAAL framework version")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
     uptime_seconds: Optional[float] = None
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class ChatRequest(BaseModel):
-    """Standard chat request for all GRAAL agents"""
+    """
+    Standard chat request for all GRAAL agents
+    Validated once by FastAPI at the route boundary; treat it as read-only
+    rather than rebuilding it (e.g. ChatRequest(**request.model_dump())).
+    """
     message: str = Field(..., min_length=1, max_length=10000, description="User message")
     context: Dict[str, Any] = Field(
         default_factory=dict, 
@@ -41,8 +45,10 @@ class ChatRequest(BaseModel):
     user_id: Optional[str] = Field(None, description="Optional user identifier")
     conversation_id: Optional[str] = Field(None, description="Optional conversation identifier")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        extra="ignore",
+        validate_assignment=False,
+        json_schema_extra={
             "example": {
                 "message": "Hello, how can you help me?",
                 "context": {"source": "web", "locale": "en"},
@@ -50,23 +56,19 @@ class ChatRequest(BaseModel):
                 "conversation_id": "conv456"
             }
         }
+    )
 
 
 class ChatResponse(BaseModel):
     """Standard chat response from all GRAAL agents"""
     response: str = Field(..., description="Agent response message")
     agent_name: str = Field(..., description="Name of the responding agent")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_utcnow)
     context: Dict[str, Any] = Field(
         default_factory=dict,
         description="Response context and metadata"
     )
     processing_time_ms: Optional[float] = Field(None, description="Processing time in milliseconds")
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
 
 
 class AgentCapability(BaseModel):
@@ -90,8 +92,3 @@ class AgentStatusResponse(BaseModel):
     uptime_seconds: Optional[float] = None
     memory_usage_mb: Optional[float] = None
     last_request: Optional[datetime] = None
-    
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat() if v else None
-        }
\ No newline at end of file